@@ -32,6 +32,14 @@ class Settings(BaseSettings):
     # MCP server settings
     mcp_name: str = Field("mcp-mitm-mem0", description="MCP server name")
 
+    # Search result caching, off by default. The cache is per process and
+    # only cleared by writes made through that process, so a cached search
+    # in the MCP server misses conversations the MITM addon has stored
+    # since, until the entry expires
+    search_cache_ttl: float = Field(
+        0.0, description="Seconds to reuse identical search results (0 disables)"
+    )
+
     # User identification
     default_user_id: str = Field(
         "default_user", description="Default user ID for memories"
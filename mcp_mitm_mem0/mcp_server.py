@@ -4,6 +4,7 @@ MCP server for Mem0 - Provides memory query and management tools.
 This server allows Claude to search, list, and manage memories stored by the MITM addon.
 """
 
+import heapq
 from typing import Any
 
 import structlog
@@ -29,6 +30,10 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# Most queries one search_memories_batch call accepts; each is a concurrent
+# request to Mem0
+MAX_BATCH_QUERIES = 10
+
 # Initialize MCP server
 mcp = FastMCP(
     settings.mcp_name,
@@ -80,6 +85,7 @@ Connect to this server when you need:
 ## Core Capabilities
 
 - **search_memories**: Find specific conversations using natural language
+- **search_memories_batch**: Run several searches in one call
 - **analyze_conversations**: Identify patterns and user preferences  
 - **list_memories**: Browse complete conversation history
 - **add_memory**: Manually store important information
@@ -214,6 +220,76 @@ async def search_memories(
         raise RuntimeError(f"Search failed: {str(e)}") from e
 
 
+@mcp.tool(
+    name="search_memories_batch",
+    description="Search conversation history with several queries in one call",
+)
+async def search_memories_batch(
+    queries: list[str], user_id: str | None = None, limit: int = 10
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Run several memory searches at once and return the results per query.
+
+    ## When to Use
+
+    - You need context on more than one topic before answering
+    - A task touches several areas (e.g. "auth", "CORS", "Docker setup")
+    - Prefer this over repeated search_memories calls: the searches run
+      concurrently, so the whole batch costs about one round trip
+
+    ## Example Usage
+
+    ```python
+    # User: "Let's pick the API work back up, the CORS error is back too"
+    results = await search_memories_batch(["API development", "CORS error"])
+    ```
+
+    Args:
+        queries: Natural language search queries (same guidelines as
+            search_memories), at most 10
+        user_id: User ID (optional, defaults to DEFAULT_USER_ID from settings)
+        limit: Maximum results to return per query (default: 10)
+
+    Returns:
+        Mapping of each query to its list of memories, sorted by relevance.
+        A query whose search failed maps to an empty list; if every search
+        failed, the call fails.
+    """
+    try:
+        if len(queries) > MAX_BATCH_QUERIES:
+            raise ValueError(
+                f"At most {MAX_BATCH_QUERIES} queries per batch, got {len(queries)}"
+            )
+
+        results = await memory_service.search_memories_batch(
+            queries=queries, user_id=user_id, limit=limit
+        )
+
+        # Report an outage as a failure, not as every query matching nothing
+        errors = [memories for memories in results if isinstance(memories, Exception)]
+        if errors and len(errors) == len(results):
+            raise errors[0]
+
+        by_query = {}
+        for query, memories in zip(queries, results, strict=True):
+            if isinstance(memories, Exception):
+                logger.warning(
+                    "Batch search query failed", query=query[:50], error=str(memories)
+                )
+                memories = []
+            by_query[query] = memories
+
+        logger.info(
+            "Batch memory search completed",
+            query_count=len(queries),
+            result_count=sum(len(memories) for memories in by_query.values()),
+        )
+        return by_query
+    except Exception as e:
+        logger.error("Batch search failed", error=str(e))
+        raise RuntimeError(f"Batch search failed: {str(e)}") from e
+
+
 @mcp.tool(name="list_memories", description="List all stored conversation memories")
 async def list_memories(user_id: str | None = None) -> list[dict[str, Any]]:
     """
@@ -432,22 +508,26 @@ async def get_user_memories(user_id: str) -> Resource:
     try:
         memories = await memory_service.get_all_memories(user_id=user_id)
 
-        # Format memories for display
-        content = f"# Memories for user: {user_id}\n\n"
-        content += f"Total memories: {len(memories)}\n\n"
+        # Format memories for display, joined once at the end since a user
+        # can have thousands of memories
+        parts = [
+            f"# Memories for user: {user_id}\n\nTotal memories: {len(memories)}\n\n"
+        ]
 
         for i, memory in enumerate(memories, 1):
-            content += f"## Memory {i}\n"
-            content += f"- ID: {memory.get('id', 'N/A')}\n"
-            content += f"- Created: {memory.get('created_at', 'N/A')}\n"
-            content += (
+            parts.append(
+                f"## Memory {i}\n"
+                f"- ID: {memory.get('id', 'N/A')}\n"
+                f"- Created: {memory.get('created_at', 'N/A')}\n"
                 f"- Content: {memory.get('memory', memory.get('content', 'N/A'))}\n"
             )
 
             if metadata := memory.get("metadata"):
-                content += f"- Metadata: {metadata}\n"
+                parts.append(f"- Metadata: {metadata}\n")
+
+            parts.append("\n")
 
-            content += "\n"
+        content = "".join(parts)
 
         return Resource(
             uri=f"memory://{user_id}",
@@ -474,25 +554,29 @@ async def get_recent_memories() -> Resource:
     try:
         memories = await memory_service.get_all_memories()
 
-        # Sort by creation date and get last 10
+        # Get the 10 newest by creation date without sorting the rest
         if memories:
             # Assuming memories have created_at field
-            sorted_memories = sorted(
-                memories, key=lambda m: m.get("created_at", ""), reverse=True
-            )[:10]
+            sorted_memories = heapq.nlargest(
+                10, memories, key=lambda m: m.get("created_at", "")
+            )
         else:
             sorted_memories = []
 
-        content = "# Recent Memories\n\n"
-        content += f"Showing {len(sorted_memories)} most recent memories\n\n"
+        parts = [
+            "# Recent Memories\n\n"
+            f"Showing {len(sorted_memories)} most recent memories\n\n"
+        ]
 
         for i, memory in enumerate(sorted_memories, 1):
-            content += f"## {i}. {memory.get('created_at', 'N/A')}\n"
-            content += f"- ID: {memory.get('id', 'N/A')}\n"
-            content += (
+            parts.append(
+                f"## {i}. {memory.get('created_at', 'N/A')}\n"
+                f"- ID: {memory.get('id', 'N/A')}\n"
                 f"- Content: {memory.get('memory', memory.get('content', 'N/A'))}\n\n"
             )
 
+        content = "".join(parts)
+
         return Resource(
             uri="memory://recent",
             name="Recent Memories",
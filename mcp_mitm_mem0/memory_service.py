@@ -4,6 +4,9 @@ Unified memory service using Mem0 SaaS platform.
 Provides both async and sync interfaces for memory operations.
 """
 
+import asyncio
+import time
+from collections import OrderedDict
 from typing import Any
 
 import structlog
@@ -13,6 +16,10 @@ from .config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Most distinct searches kept in the result cache before the least recently
+# used entry is evicted
+SEARCH_CACHE_SIZE = 128
+
 
 class MemoryService:
     """Memory service wrapper for Mem0 SaaS platform."""
@@ -43,8 +50,18 @@ class MemoryService:
 
         self.async_client = AsyncMemoryClient(**client_kwargs)
 
+        # (query, filters, limit) -> (monotonic time stored, results)
+        self._search_cache: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+        # Bumped on every write so searches in flight during it aren't cached
+        self._write_generation = 0
+
         self._logger = logger.bind(service="memory")
 
+    def _invalidate_search_cache(self) -> None:
+        """Drop cached searches after a write made through this service."""
+        self._search_cache.clear()
+        self._write_generation += 1
+
     async def add_memory(
         self,
         messages: list[dict[str, Any]],
@@ -99,6 +116,7 @@ class MemoryService:
             )
 
             result = await self.async_client.add(**add_params)
+            self._invalidate_search_cache()
 
             self._logger.info(
                 "Memory added successfully",
@@ -165,8 +183,31 @@ class MemoryService:
                 "top_k": limit,
             }
 
+            # With SEARCH_CACHE_TTL set, identical searches shortly after one
+            # another (reflection passes, repeated tool calls) reuse the
+            # previous results
+            cache_key = (query, tuple(filters.items()), limit)
+            now = time.monotonic()
+            cached = self._search_cache.get(cache_key)
+            if cached and now - cached[0] < settings.search_cache_ttl:
+                self._search_cache.move_to_end(cache_key)
+                self._logger.info(
+                    "Search served from cache",
+                    user_id=user_id,
+                    result_count=len(cached[1]),
+                )
+                return list(cached[1])
+
+            generation = self._write_generation
             results = await self.async_client.search(**search_params)
 
+            # Results fetched across a write may predate it; don't keep them
+            if settings.search_cache_ttl > 0 and generation == self._write_generation:
+                self._search_cache[cache_key] = (now, list(results))
+                self._search_cache.move_to_end(cache_key)
+                if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+
             self._logger.info(
                 "Search completed", user_id=user_id, result_count=len(results)
             )
@@ -186,6 +227,37 @@ class MemoryService:
             )
             raise
 
+    async def search_memories_batch(
+        self, queries: list[str], user_id: str | None = None, limit: int = 10
+    ) -> list[list[dict[str, Any]] | Exception]:
+        """Run several memory searches concurrently.
+
+        Mem0 has no multi-query search, so the searches are fanned out
+        together and awaited as one batch. Repeated queries are searched
+        once. A failed search does not cancel the others; its exception is
+        returned in place of its results so callers can handle it.
+
+        Args:
+            queries: Search queries
+            user_id: User identifier (defaults to settings.default_user_id)
+            limit: Maximum number of results per query
+
+        Returns:
+            One list of matching memories per query, in query order, or the
+            exception that query's search raised
+        """
+        unique_queries = list(dict.fromkeys(queries))
+        results = await asyncio.gather(
+            *[
+                self.search_memories(query=query, user_id=user_id, limit=limit)
+                for query in unique_queries
+            ],
+            return_exceptions=True,
+        )
+
+        by_query = dict(zip(unique_queries, results, strict=True))
+        return [by_query[query] for query in queries]
+
     async def get_all_memories(
         self, user_id: str | None = None
     ) -> list[dict[str, Any]]:
@@ -226,6 +298,7 @@ class MemoryService:
             self._logger.info("Deleting memory", memory_id=memory_id)
 
             result = await self.async_client.delete(memory_id=memory_id)
+            self._invalidate_search_cache()
 
             self._logger.info("Memory deleted", memory_id=memory_id)
             return result
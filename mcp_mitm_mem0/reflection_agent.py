@@ -5,6 +5,12 @@ This agent reviews conversations between the user and Claude, identifies pattern
 and can add enriched memories or hints back to the memory store.
 """
 
+import asyncio
+import heapq
+import re
+import time
+from collections.abc import Iterable
+from itertools import chain
 from typing import Any
 
 import structlog
@@ -15,6 +21,167 @@ from .memory_service import memory_service
 
 logger = structlog.get_logger(__name__)
 
+# Keyword classes for pattern analysis, compiled once and matched
+# case-insensitively so memories don't need a lowercased copy
+CODING_KEYWORDS_RE = re.compile(r"function|class|implement|code|debug", re.IGNORECASE)
+APPROACH_KEYWORDS_RE = re.compile(r"try|attempt|approach|solution", re.IGNORECASE)
+
+# Technical terms worth carrying into follow-up search queries
+TECH_KEYWORDS = (
+    "react",
+    "typescript",
+    "javascript",
+    "python",
+    "node",
+    "docker",
+    "api",
+    "database",
+    "authentication",
+    "auth",
+    "jwt",
+    "cors",
+    "error",
+    "component",
+    "function",
+    "class",
+    "module",
+    "package",
+    "framework",
+)
+
+# Topic classes for search query extraction, fused into one alternation so a
+# memory is scanned once; each named group maps to the query it contributes
+TOPIC_KEYWORDS_RE = re.compile(
+    r"(?P<errors>error|problem|issue)"
+    r"|(?P<implementation>implement|build|create|develop)"
+    r"|(?P<learning>how|what|why|explain|understand)"
+)
+TOPIC_QUERIES = {
+    "errors": "errors debugging troubleshooting",
+    "implementation": "implementation development coding",
+    "learning": "learning questions understanding",
+}
+
+# Recurring issue types and the keywords that indicate them
+ISSUE_PATTERNS = {
+    "CORS issues": ["cors", "cross-origin", "access-control"],
+    "type errors": ["type error", "typescript error", "cannot read property"],
+    "import/export issues": ["import", "export", "module", "cannot resolve"],
+    "build errors": ["build failed", "compilation error", "webpack"],
+    "API errors": ["api error", "fetch failed", "network error", "status 500"],
+    "dependency issues": ["npm install", "package", "dependency", "version conflict"],
+}
+ISSUE_TYPES = tuple(ISSUE_PATTERNS)
+
+# All issue keywords in a single alternation, one group per issue type, so a
+# memory is scanned once; match.lastindex - 1 indexes into ISSUE_TYPES
+ISSUE_PATTERNS_RE = re.compile(
+    "|".join(
+        f"({'|'.join(map(re.escape, keywords))})"
+        for keywords in ISSUE_PATTERNS.values()
+    ),
+    re.IGNORECASE,
+)
+
+# Technical topics recognised in repeated questions, in priority order
+QUESTION_TOPICS = {
+    "react": ["react", "jsx", "component", "hook", "usestate", "useeffect"],
+    "typescript": ["typescript", "type", "interface", "generic"],
+    "authentication": ["auth", "login", "jwt", "token", "session"],
+    "database": ["database", "sql", "query", "table", "schema"],
+    "api": ["api", "endpoint", "request", "response", "http"],
+    "css": ["css", "style", "layout", "flexbox", "grid"],
+    "testing": ["test", "spec", "mock", "assertion"],
+}
+QUESTION_TOPIC_NAMES = tuple(QUESTION_TOPICS)
+QUESTION_TOPICS_RE = re.compile(
+    "|".join(
+        f"({'|'.join(map(re.escape, keywords))})"
+        for keywords in QUESTION_TOPICS.values()
+    ),
+    re.IGNORECASE,
+)
+
+# Project types tracked for incomplete work, and words that mark completion
+PROJECT_PATTERNS = {
+    "authentication system": ("auth system", "authentication", "login system"),
+    "API development": ("api", "backend", "server", "endpoint"),
+    "frontend application": ("frontend", "ui", "interface", "component"),
+    "database integration": ("database", "db", "schema", "migration"),
+    "testing framework": ("test", "testing", "spec", "automation"),
+}
+COMPLETION_KEYWORDS = ("finished", "completed", "done", "deployed", "released")
+PROJECT_TYPES = tuple(PROJECT_PATTERNS)
+
+# One alternation per table, matched case-insensitively; a project match's
+# lastindex - 1 indexes into PROJECT_TYPES
+PROJECT_PATTERNS_RE = re.compile(
+    "|".join(
+        f"({'|'.join(map(re.escape, keywords))})"
+        for keywords in PROJECT_PATTERNS.values()
+    ),
+    re.IGNORECASE,
+)
+COMPLETION_KEYWORDS_RE = re.compile("|".join(COMPLETION_KEYWORDS), re.IGNORECASE)
+
+# Searches behind next-step suggestions: recurring issues, then projects
+NEXT_STEP_QUERIES = [
+    "error problem issue bug failed",
+    "implement build create project working on",
+]
+
+# Static parts of the enhanced reflection request, built once at import
+REFLECTION_SYSTEM_PROMPT = "You are a reflection agent analyzing conversation patterns and decision-making quality."
+
+REFLECTION_PROMPT_HEADER = """You are analyzing a conversation between a user and Claude to identify patterns, decision-making quality, and opportunities for knowledge consolidation.
+
+## Recent Messages to Analyze:
+"""
+
+REFLECTION_PROMPT_TASKS = """
+
+## Analysis Tasks:
+Please analyze the above conversation and provide insights in the following areas:
+
+1. **Decision-Making Patterns**: How is Claude approaching problems? Is the reasoning sound?
+2. **Knowledge Gaps**: What information seems to be missing or could be better consolidated?
+3. **Communication Effectiveness**: How well is Claude explaining concepts and solutions?
+4. **Learning Opportunities**: What patterns suggest opportunities for better memory consolidation?
+5. **Behavioral Insights**: What does this conversation reveal about the user's needs and preferences?
+
+## Output Format:
+Provide a structured analysis with actionable insights that can help improve future conversations. Focus on meta-level observations about reasoning quality and knowledge consolidation opportunities.
+"""
+
+REFLECTION_CATEGORIES = [
+    {
+        "name": "reflection",
+        "description": "Meta-analysis of conversation patterns",
+    },
+    {
+        "name": "reasoning_quality",
+        "description": "Assessment of decision-making patterns",
+    },
+    {
+        "name": "knowledge_consolidation",
+        "description": "Opportunities for better memory organization",
+    },
+]
+
+
+def _memory_text(memory: dict[str, Any]) -> Any:
+    """Return a memory's text, preferring Mem0's "memory" over "content"."""
+    # Only fall back to "content" when needed rather than looking it up for
+    # every memory as a .get() default
+    if "memory" in memory:
+        return memory["memory"]
+    return memory.get("content", "")
+
+
+def _clip(text: str, limit: int) -> str:
+    """Truncate text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
 
 class ReflectionAgent:
     """Agent that reflects on conversations and curates memory insights."""
@@ -50,10 +217,11 @@ class ReflectionAgent:
             if not all_memories:
                 return {"status": "no_memories", "insights": []}
 
-            # Get recent memories for recency bias
-            recent_memories = sorted(
-                all_memories, key=lambda m: m.get("created_at", ""), reverse=True
-            )[: limit // 2]  # Half from recent
+            # Get recent memories for recency bias; nlargest keeps only the
+            # newest half of the limit instead of sorting every memory
+            recent_memories = heapq.nlargest(
+                limit // 2, all_memories, key=lambda m: m.get("created_at", "")
+            )
 
             # Get semantically relevant memories using pattern-based queries
             relevant_memories = await self._get_relevant_memories_for_analysis(
@@ -64,7 +232,7 @@ class ReflectionAgent:
 
             # Combine and deduplicate
             combined_memories = self._deduplicate_memories(
-                recent_memories + relevant_memories
+                chain(recent_memories, relevant_memories)
             )
 
             insights = await self._analyze_patterns(combined_memories)
@@ -103,7 +271,7 @@ class ReflectionAgent:
         approaches_tried = []
 
         for memory in memories:
-            content = memory.get("memory", memory.get("content", ""))
+            content = _memory_text(memory)
 
             # Simple pattern matching (could be enhanced with LLM analysis)
             if isinstance(content, str):
@@ -112,19 +280,13 @@ class ReflectionAgent:
                     questions_asked.append(content)
 
                 # Track code-related discussions
-                if any(
-                    keyword in content.lower()
-                    for keyword in ["function", "class", "implement", "code", "debug"]
-                ):
+                if CODING_KEYWORDS_RE.search(content):
                     if "coding" not in topics:
                         topics["coding"] = 0
                     topics["coding"] += 1
 
                 # Track problem-solving approaches
-                if any(
-                    keyword in content.lower()
-                    for keyword in ["try", "attempt", "approach", "solution"]
-                ):
+                if APPROACH_KEYWORDS_RE.search(content):
                     approaches_tried.append(content)
 
         # Generate insights based on patterns
@@ -164,24 +326,27 @@ class ReflectionAgent:
         Returns:
             Created memory result
         """
-        # Format insights as a reflection message
-        reflection_content = "## Conversation Analysis\n\n"
+        # Format insights as a reflection message, assembled in one join
+        parts = ["## Conversation Analysis\n\n"]
 
         for insight in insights:
-            reflection_content += f"### {insight['type'].replace('_', ' ').title()}\n"
-            reflection_content += f"{insight['description']}\n"
+            parts.append(
+                f"### {insight['type'].replace('_', ' ').title()}\n"
+                f"{insight['description']}\n"
+            )
 
             if "recommendation" in insight:
-                reflection_content += (
-                    f"**Recommendation:** {insight['recommendation']}\n"
-                )
+                parts.append(f"**Recommendation:** {insight['recommendation']}\n")
 
             if "examples" in insight:
-                reflection_content += "\n**Examples:**\n"
-                for example in insight["examples"][:3]:
-                    reflection_content += f"- {example[:100]}...\n"
+                parts.append("\n**Examples:**\n")
+                parts.extend(
+                    f"- {example[:100]}...\n" for example in insight["examples"][:3]
+                )
 
-            reflection_content += "\n"
+            parts.append("\n")
+
+        reflection_content = "".join(parts)
 
         # Store as a reflection memory
         messages = [
@@ -220,21 +385,27 @@ class ReflectionAgent:
         user_id = user_id or settings.default_user_id
 
         try:
-            # Analyze recent conversations
-            analysis = await self.analyze_recent_conversations(user_id=user_id)
+            # Search for repeated issues and incomplete projects while analyzing
+            # recent conversations; the two don't depend on each other. The
+            # task group cancels the other if one fails. The analysis stores
+            # a reflection mid-search, so with SEARCH_CACHE_TTL set these
+            # results are never cached; the overlap is worth more here.
+            async with asyncio.TaskGroup() as tasks:
+                search_task = tasks.create_task(
+                    memory_service.search_memories_batch(
+                        queries=NEXT_STEP_QUERIES, user_id=user_id, limit=10
+                    )
+                )
+                analysis_task = tasks.create_task(
+                    self.analyze_recent_conversations(user_id=user_id)
+                )
+            issue_memories, project_memories = search_task.result()
+            analysis = analysis_task.result()
+            for memories in (issue_memories, project_memories):
+                if isinstance(memories, Exception):
+                    raise memories
             insights = analysis.get("insights", [])
 
-            # Search for repeated issues or incomplete projects
-            issue_memories = await memory_service.search_memories(
-                query="error problem issue bug failed", user_id=user_id, limit=10
-            )
-
-            project_memories = await memory_service.search_memories(
-                query="implement build create project working on",
-                user_id=user_id,
-                limit=10,
-            )
-
             suggestions = []
 
             # Generate suggestions from pattern analysis
@@ -280,7 +451,9 @@ class ReflectionAgent:
             return suggestions[:10]  # Limit to top 10 suggestions
 
         except Exception as e:
-            self._logger.error("Failed to suggest next steps", error=str(e))
+            # Report the task's own error rather than the TaskGroup wrapper
+            error = e.exceptions[0] if isinstance(e, ExceptionGroup) else e
+            self._logger.error("Failed to suggest next steps", error=str(error))
             return []
 
     async def reflect_on_messages(
@@ -315,7 +488,7 @@ class ReflectionAgent:
 
             # Use claude-code-sdk for enhanced reasoning
             options = ClaudeCodeOptions(
-                system_prompt="You are a reflection agent analyzing conversation patterns and decision-making quality.",
+                system_prompt=REFLECTION_SYSTEM_PROMPT,
                 max_turns=1,
             )
 
@@ -367,38 +540,22 @@ class ReflectionAgent:
     ) -> str:
         """Build a comprehensive reflection prompt for claude-code-sdk analysis."""
 
-        prompt = """You are analyzing a conversation between a user and Claude to identify patterns, decision-making quality, and opportunities for knowledge consolidation.
-
-## Recent Messages to Analyze:
-"""
+        parts = [REFLECTION_PROMPT_HEADER]
 
         for i, msg in enumerate(messages):
             role = msg.get("role", "unknown")
             content = msg.get("content", "")
-            prompt += f"\n{i + 1}. **{role.title()}**: {content[:500]}{'...' if len(content) > 500 else ''}\n"
+            parts.append(f"\n{i + 1}. **{role.title()}**: {_clip(content, 500)}\n")
 
         if context_memories:
-            prompt += "\n## Relevant Context from Memory:\n"
+            parts.append("\n## Relevant Context from Memory:\n")
             for memory in context_memories[:5]:  # Limit to top 5 for brevity
-                memory_content = memory.get("memory", memory.get("content", ""))
-                prompt += f"\n- {memory_content[:200]}{'...' if len(memory_content) > 200 else ''}\n"
-
-        prompt += """
+                memory_content = _memory_text(memory)
+                parts.append(f"\n- {_clip(memory_content, 200)}\n")
 
-## Analysis Tasks:
-Please analyze the above conversation and provide insights in the following areas:
-
-1. **Decision-Making Patterns**: How is Claude approaching problems? Is the reasoning sound?
-2. **Knowledge Gaps**: What information seems to be missing or could be better consolidated?
-3. **Communication Effectiveness**: How well is Claude explaining concepts and solutions?
-4. **Learning Opportunities**: What patterns suggest opportunities for better memory consolidation?
-5. **Behavioral Insights**: What does this conversation reveal about the user's needs and preferences?
-
-## Output Format:
-Provide a structured analysis with actionable insights that can help improve future conversations. Focus on meta-level observations about reasoning quality and knowledge consolidation opportunities.
-"""
+        parts.append(REFLECTION_PROMPT_TASKS)
 
-        return prompt
+        return "".join(parts)
 
     async def _store_enhanced_reflection(
         self, insights: list[str], messages: list[dict[str, Any]], user_id: str
@@ -428,7 +585,7 @@ Provide a structured analysis with actionable insights that can help improve fut
             "source": "reflection_agent_claude_sdk",
             "analyzed_message_count": len(messages),
             "reflection_agent": True,
-            "timestamp": str(int(__import__("time").time())),
+            "timestamp": str(int(time.time())),
         }
 
         # Store with special agent_id
@@ -437,20 +594,7 @@ Provide a structured analysis with actionable insights that can help improve fut
             user_id=user_id,
             agent_id="reflect-agent",  # Special agent ID as requested
             metadata=metadata,
-            categories=[
-                {
-                    "name": "reflection",
-                    "description": "Meta-analysis of conversation patterns",
-                },
-                {
-                    "name": "reasoning_quality",
-                    "description": "Assessment of decision-making patterns",
-                },
-                {
-                    "name": "knowledge_consolidation",
-                    "description": "Opportunities for better memory organization",
-                },
-            ],
+            categories=REFLECTION_CATEGORIES,
         )
 
         return result
@@ -473,15 +617,22 @@ Provide a structured analysis with actionable insights that can help improve fut
             else remaining_limit
         )
 
-        for query in search_queries:
-            try:
-                memories = await memory_service.search_memories(
-                    query=query, user_id=user_id, limit=memories_per_query
+        try:
+            results = await memory_service.search_memories_batch(
+                queries=search_queries, user_id=user_id, limit=memories_per_query
+            )
+        except Exception as e:
+            # Fall back to analyzing the recent memories alone
+            self._logger.warning("Relevant memory search failed", error=str(e))
+            return []
+
+        for search_query, memories in zip(search_queries, results, strict=True):
+            if isinstance(memories, Exception):
+                self._logger.warning(
+                    f"Search failed for query '{search_query}'", error=str(memories)
                 )
-                relevant_memories.extend(memories)
-            except Exception as e:
-                self._logger.warning(f"Search failed for query '{query}'", error=str(e))
                 continue
+            relevant_memories.extend(memories)
 
         return relevant_memories[:remaining_limit]
 
@@ -490,71 +641,29 @@ Provide a structured analysis with actionable insights that can help improve fut
     ) -> list[str]:
         """Extract search queries from recent memories to find related patterns."""
 
-        queries = []
-        topics = set()
+        # Insertion-ordered so the five kept queries are the first found,
+        # rather than whichever a set happens to iterate first
+        topics: dict[str, None] = {}
 
         for memory in memories:
-            content = memory.get("memory", memory.get("content", ""))
+            content = _memory_text(memory)
             if not isinstance(content, str):
                 continue
 
             content_lower = content.lower()
 
             # Look for technical terms, errors, and project-related keywords
-            technical_terms = []
-
-            # Extract technical keywords
-            tech_keywords = [
-                "react",
-                "typescript",
-                "javascript",
-                "python",
-                "node",
-                "docker",
-                "api",
-                "database",
-                "authentication",
-                "auth",
-                "jwt",
-                "cors",
-                "error",
-                "component",
-                "function",
-                "class",
-                "module",
-                "package",
-                "framework",
+            technical_terms = [
+                keyword for keyword in TECH_KEYWORDS if keyword in content_lower
             ]
 
-            for keyword in tech_keywords:
-                if keyword in content_lower:
-                    technical_terms.append(keyword)
-
-            # Look for error patterns
-            if (
-                "error" in content_lower
-                or "problem" in content_lower
-                or "issue" in content_lower
-            ):
-                topics.add("errors debugging troubleshooting")
-
-            # Look for implementation patterns
-            if any(
-                word in content_lower
-                for word in ["implement", "build", "create", "develop"]
-            ):
-                topics.add("implementation development coding")
-
-            # Look for learning patterns
-            if any(
-                word in content_lower
-                for word in ["how", "what", "why", "explain", "understand"]
-            ):
-                topics.add("learning questions understanding")
-
-            # Add technical terms as topics
+            # Look for error, implementation and learning patterns in one pass
+            for match in TOPIC_KEYWORDS_RE.finditer(content_lower):
+                topics[TOPIC_QUERIES[match.lastgroup]] = None
+
+            # Add technical terms as topics, limited to 3 terms per query
             if technical_terms:
-                topics.add(" ".join(technical_terms[:3]))  # Limit to 3 terms per query
+                topics[" ".join(technical_terms[:3])] = None
 
         # Convert topics to search queries
         queries = list(topics)[:5]  # Limit to 5 queries to avoid too many API calls
@@ -568,41 +677,28 @@ Provide a structured analysis with actionable insights that can help improve fut
         return queries
 
     def _deduplicate_memories(
-        self, memories: list[dict[str, Any]]
+        self, memories: Iterable[dict[str, Any]]
     ) -> list[dict[str, Any]]:
         """Remove duplicate memories based on ID."""
-        seen_ids = set()
-        deduplicated = []
-
+        # Dicts keep insertion order, so the first copy of each ID wins;
+        # memories without IDs are keyed by identity and kept for safety
+        unique: dict[Any, dict[str, Any]] = {}
         for memory in memories:
-            memory_id = memory.get("id")
-            if memory_id and memory_id not in seen_ids:
-                seen_ids.add(memory_id)
-                deduplicated.append(memory)
-            elif not memory_id:  # Keep memories without IDs for safety
-                deduplicated.append(memory)
+            unique.setdefault(memory.get("id") or id(memory), memory)
 
-        return deduplicated
+        return list(unique.values())
 
     def _extract_topic_from_questions(self, questions: list[str]) -> str:
         """Extract the main topic from a list of questions."""
 
-        # Common technical topics
-        topics = {
-            "react": ["react", "jsx", "component", "hook", "usestate", "useeffect"],
-            "typescript": ["typescript", "type", "interface", "generic"],
-            "authentication": ["auth", "login", "jwt", "token", "session"],
-            "database": ["database", "sql", "query", "table", "schema"],
-            "api": ["api", "endpoint", "request", "response", "http"],
-            "css": ["css", "style", "layout", "flexbox", "grid"],
-            "testing": ["test", "spec", "mock", "assertion"],
+        # Collect every topic mentioned in one pass, then pick the one listed
+        # first in QUESTION_TOPICS
+        matched = {
+            match.lastindex
+            for match in QUESTION_TOPICS_RE.finditer(" ".join(questions))
         }
-
-        question_text = " ".join(questions).lower()
-
-        for topic, keywords in topics.items():
-            if any(keyword in question_text for keyword in keywords):
-                return topic
+        if matched:
+            return QUESTION_TOPIC_NAMES[min(matched) - 1]
 
         return "general programming topics"
 
@@ -614,44 +710,15 @@ Provide a structured analysis with actionable insights that can help improve fut
         issue_counts = {}
 
         for memory in issue_memories:
-            content = memory.get("memory", memory.get("content", ""))
+            content = _memory_text(memory)
             if not isinstance(content, str):
                 continue
 
-            content_lower = content.lower()
-
-            # Look for common issue patterns
-            issue_patterns = {
-                "CORS issues": ["cors", "cross-origin", "access-control"],
-                "type errors": [
-                    "type error",
-                    "typescript error",
-                    "cannot read property",
-                ],
-                "import/export issues": [
-                    "import",
-                    "export",
-                    "module",
-                    "cannot resolve",
-                ],
-                "build errors": ["build failed", "compilation error", "webpack"],
-                "API errors": [
-                    "api error",
-                    "fetch failed",
-                    "network error",
-                    "status 500",
-                ],
-                "dependency issues": [
-                    "npm install",
-                    "package",
-                    "dependency",
-                    "version conflict",
-                ],
-            }
-
-            for issue_type, keywords in issue_patterns.items():
-                if any(keyword in content_lower for keyword in keywords):
-                    issue_counts[issue_type] = issue_counts.get(issue_type, 0) + 1
+            # Look for common issue patterns, counting each type once per memory
+            matched = {match.lastindex for match in ISSUE_PATTERNS_RE.finditer(content)}
+            for index in sorted(matched):
+                issue_type = ISSUE_TYPES[index - 1]
+                issue_counts[issue_type] = issue_counts.get(issue_type, 0) + 1
 
         # Return issues that appear more than once
         return [issue for issue, count in issue_counts.items() if count > 1]
@@ -662,44 +729,31 @@ Provide a structured analysis with actionable insights that can help improve fut
         """Identify potentially incomplete projects from memory content."""
 
         project_keywords = {}
-        completion_keywords = ["finished", "completed", "done", "deployed", "released"]
 
         for memory in project_memories:
-            content = memory.get("memory", memory.get("content", ""))
+            content = _memory_text(memory)
             if not isinstance(content, str):
                 continue
 
-            content_lower = content.lower()
+            # Check once whether this memory suggests completion
+            completed = COMPLETION_KEYWORDS_RE.search(content) is not None
 
             # Look for project names/types
-            project_patterns = {
-                "authentication system": [
-                    "auth system",
-                    "authentication",
-                    "login system",
-                ],
-                "API development": ["api", "backend", "server", "endpoint"],
-                "frontend application": ["frontend", "ui", "interface", "component"],
-                "database integration": ["database", "db", "schema", "migration"],
-                "testing framework": ["test", "testing", "spec", "automation"],
+            matched = {
+                match.lastindex for match in PROJECT_PATTERNS_RE.finditer(content)
             }
-
-            for project_type, keywords in project_patterns.items():
-                if any(keyword in content_lower for keyword in keywords):
-                    if project_type not in project_keywords:
-                        project_keywords[project_type] = {
-                            "mentions": 0,
-                            "completed": False,
-                        }
-
-                    project_keywords[project_type]["mentions"] += 1
-
-                    # Check if this memory suggests completion
-                    if any(
-                        completion in content_lower
-                        for completion in completion_keywords
-                    ):
-                        project_keywords[project_type]["completed"] = True
+            for index in sorted(matched):
+                project_type = PROJECT_TYPES[index - 1]
+                if project_type not in project_keywords:
+                    project_keywords[project_type] = {
+                        "mentions": 0,
+                        "completed": False,
+                    }
+
+                project_keywords[project_type]["mentions"] += 1
+
+                if completed:
+                    project_keywords[project_type]["completed"] = True
 
         # Return projects with multiple mentions but no completion indicators
         incomplete = []
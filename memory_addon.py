@@ -42,6 +42,18 @@ logger = structlog.get_logger(__name__)
 RECENT_MESSAGES_LIMIT = 5
 REFLECTION_MESSAGE_THRESHOLD = 5
 
+# Claude Code's background haiku calls (titles, summaries) are never stored
+SKIPPED_MODEL_PREFIX = "claude-3-5-haiku-"
+
+# SSE event types parse_sse_response acts on; payloads of any other event
+# (ping, message_delta, message_stop) are skipped without being decoded
+SSE_HANDLED_EVENTS = frozenset({
+    b"message_start",
+    b"content_block_start",
+    b"content_block_delta",
+    b"content_block_stop",
+})
+
 
 def parse_sse_response(content: bytes) -> dict:
     """Parse Server-Sent Events response to extract complete Claude response.
@@ -56,19 +68,36 @@ def parse_sse_response(content: bytes) -> dict:
         return {}
 
     try:
-        content_str = content.decode("utf-8")
-        lines = content_str.strip().split("\n")
-
         # Reconstruct the complete response from SSE events
         response_data = {"content": [], "model": "", "usage": {}, "type": "message"}
 
         current_content_block = None
         current_text = ""
+        event_name = None
+
+        # Bind the decoder locally; it runs once per event in a stream
+        loads = json.loads
+
+        # Scan the raw bytes: the "event:" line names each event's type, so
+        # only the payloads we actually use get decoded
+        for line in content.splitlines():
+            if not line:
+                event_name = None  # Blank line ends the event
+            elif line.startswith(b"event: "):
+                event_name = line[7:].strip()
+            elif line.startswith(b"data: "):
+                if event_name is not None:
+                    if event_name not in SSE_HANDLED_EVENTS:
+                        continue
+                    # Tool input deltas can be large and are never stored
+                    if (
+                        event_name == b"content_block_delta"
+                        and b'"text_delta"' not in line
+                    ):
+                        continue
 
-        for line in lines:
-            if line.startswith("data: "):
                 try:
-                    event_data = json.loads(line[6:])  # Remove 'data: ' prefix
+                    event_data = loads(line[6:])  # Remove 'data: ' prefix
                     event_type = event_data.get("type", "")
 
                     if event_type == "message_start":
@@ -185,7 +214,28 @@ class MemoryAddon:
         if flow.request.path.startswith("/v1/messages"):
             try:
                 request_data = json.loads(flow.request.content)
-                flow.metadata["claude_request"] = request_data
+                model = request_data.get("model") or "unknown"
+
+                # Skip requests whose responses would be discarded anyway, so
+                # response() returns before reading or parsing the body
+                if isinstance(model, str) and model.startswith(SKIPPED_MODEL_PREFIX):
+                    return
+
+                messages = request_data.get("messages") or []
+
+                last_user_msg = None
+                for msg in reversed(messages):
+                    if msg.get("role") == "user":
+                        last_user_msg = msg
+                        break
+
+                # Keep only what response() needs rather than the full request
+                # body (system prompt, tool schemas, whole history) per flow
+                flow.metadata["claude_request"] = {
+                    "model": model,
+                    "last_user_message": last_user_msg,
+                    "message_count": len(messages),
+                }
             except Exception as e:
                 self.logger.error("Failed to parse request", error=str(e))
 
@@ -208,15 +258,21 @@ class MemoryAddon:
                 "content-type", ""
             )
 
+            # Cheap byte checks before any parsing: an empty body has nothing
+            # to store, and a stream without text deltas has no text blocks
+            body = flow.response.content
+            if not body or (is_streaming and b'"text_delta"' not in body):
+                return
+
             if is_streaming:
-                response_data = parse_sse_response(flow.response.content)
+                response_data = parse_sse_response(body)
                 # Only process if we have actual content (complete response)
                 if not response_data.get("content") or not response_data.get(
                     "content", [{}]
                 )[0].get("text"):
                     return  # Skip incomplete streaming chunks
             else:
-                response_data = json.loads(flow.response.content)
+                response_data = json.loads(body)
 
             if not response_data:
                 return
@@ -235,38 +291,32 @@ class MemoryAddon:
             )
 
             model = response_data.get("model", "")
-            if model.startswith("claude-3-5-haiku-"):
+            if model.startswith(SKIPPED_MODEL_PREFIX):
                 return
 
             # Build conversation messages - only store the current turn (latest user + assistant)
             messages = []
 
-            if "messages" in request_data and request_data["messages"]:
-                last_user_msg = None
-                for msg in reversed(request_data["messages"]):
-                    if msg.get("role") == "user":
-                        last_user_msg = msg
-                        break
-
-                if last_user_msg:
-                    # Extract text content properly - handle both string and array formats
-                    content = last_user_msg.get("content", "")
-                    if isinstance(content, list):
-                        # Extract text from content blocks (tool results, text blocks, etc.)
-                        text_parts = []
-                        for block in content:
-                            if isinstance(block, dict):
-                                if block.get("type") == "text":
-                                    text_parts.append(block.get("text", ""))
-                                elif block.get("type") == "tool_result":
-                                    text_parts.append(block.get("content", ""))
-                        content = " ".join(text_parts)
-
-                    if content:  # Only add if we have actual content
-                        messages.append({
-                            "role": "user",
-                            "content": content,
-                        })
+            last_user_msg = request_data.get("last_user_message")
+            if last_user_msg:
+                # Extract text content properly - handle both string and array formats
+                content = last_user_msg.get("content", "")
+                if isinstance(content, list):
+                    # Extract text from content blocks (tool results, text blocks, etc.)
+                    text_parts = []
+                    for block in content:
+                        if isinstance(block, dict):
+                            if block.get("type") == "text":
+                                text_parts.append(block.get("text", ""))
+                            elif block.get("type") == "tool_result":
+                                text_parts.append(block.get("content", ""))
+                    content = " ".join(text_parts)
+
+                if content:  # Only add if we have actual content
+                    messages.append({
+                        "role": "user",
+                        "content": content,
+                    })
 
             if "content" in response_data and response_data["content"]:
                 assistant_content = " ".join([
@@ -356,7 +406,7 @@ class MemoryAddon:
             else:
                 self.logger.warning(
                     "No messages found to store",
-                    request_messages_count=len(request_data.get("messages", [])),
+                    request_messages_count=request_data.get("message_count", 0),
                     response_content_exists=bool(response_data.get("content")),
                 )
 
@@ -10,29 +10,34 @@ import pytest
 
 
 @pytest.fixture
-def mock_settings():
-    """Standard settings mock with test configuration."""
-    with patch("mcp_mitm_mem0.config.settings") as mock:
-        mock.mem0_api_key = "test-api-key"
-        mock.default_user_id = "test-user"
-        mock.mcp_name = "mcp-mitm-mem0"
-        mock.debug = False
-        mock.mitm_host = "localhost"
-        mock.mitm_port = 8080
-        yield mock
+def mock_settings(monkeypatch):
+    """Standard settings with test configuration.
+
+    Overrides attributes on the shared settings instance rather than
+    replacing it with a MagicMock, so modules that imported ``settings``
+    by name see the test values too.
+    """
+    from mcp_mitm_mem0.config import settings
+
+    monkeypatch.setattr(settings, "mem0_api_key", "test-api-key")
+    monkeypatch.setattr(settings, "default_user_id", "test-user")
+    monkeypatch.setattr(settings, "mcp_name", "mcp-mitm-mem0")
+    monkeypatch.setattr(settings, "debug", False)
+    monkeypatch.setattr(settings, "mitm_host", "localhost")
+    monkeypatch.setattr(settings, "mitm_port", 8080)
+    return settings
 
 
 @pytest.fixture
 def mock_memory_clients():
-    """Mocked async and sync Mem0 clients with standard behavior."""
-    with (
-        patch("mcp_mitm_mem0.memory_service.AsyncMemoryClient") as mock_async_class,
-        patch("mcp_mitm_mem0.memory_service.MemoryClient") as mock_sync_class,
-    ):
-        mock_async_instance = AsyncMock()
-        mock_sync_instance = Mock()
-        mock_async_class.return_value = mock_async_instance
-        mock_sync_class.return_value = mock_sync_instance
+    """Mocked async and sync Mem0 clients with standard behavior.
+
+    MemoryService only constructs the async client; the sync mock is kept
+    for tests that unpack both.
+    """
+    with patch("mcp_mitm_mem0.memory_service.AsyncMemoryClient") as mock_async_class:
+        mock_sync_class = Mock()
+        mock_async_class.return_value = AsyncMock()
         yield mock_async_class, mock_sync_class
 
 
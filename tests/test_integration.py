@@ -82,6 +82,9 @@ class TestComponentIntegration:
             mock_service.add_memory = AsyncMock(
                 return_value={"id": "reflection-mem-456"}
             )
+            mock_service.search_memories_batch = AsyncMock(
+                side_effect=lambda queries, **kwargs: [[] for _ in queries]
+            )
 
             # Analyze conversations
             result = await agent.analyze_recent_conversations("integration_user")
@@ -415,6 +418,9 @@ class TestComponentIntegration:
             mock_reflection_service.add_memory = AsyncMock(
                 return_value={"id": "reflection"}
             )
+            mock_reflection_service.search_memories_batch = AsyncMock(
+                side_effect=lambda queries, **kwargs: [[] for _ in queries]
+            )
 
             # Test MCP server with unicode
             unicode_messages = [{"role": "user", "content": unicode_content}]
@@ -14,6 +14,7 @@ from mcp_mitm_mem0.mcp_server import (
     delete_memory,
     list_memories,
     search_memories,
+    search_memories_batch,
     suggest_next_actions,
 )
 
@@ -50,6 +51,61 @@ class TestMCPTools:
             query="test query", user_id="user", limit=10
         )
 
+    @pytest.mark.asyncio
+    async def test_search_memories_batch_maps_results_to_queries(
+        self, mock_mcp_dependencies, sample_memories
+    ):
+        """Test batch search returns each query's results under that query."""
+        mock_memory, mock_agent, mock_settings = mock_mcp_dependencies
+        mock_memory.search_memories_batch = AsyncMock(
+            return_value=[sample_memories[:1], []]
+        )
+
+        result = await search_memories_batch(["CORS error", "Docker"], "test-user")
+
+        assert result == {"CORS error": sample_memories[:1], "Docker": []}
+        mock_memory.search_memories_batch.assert_called_once_with(
+            queries=["CORS error", "Docker"], user_id="test-user", limit=10
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_memories_batch_partial_failure(
+        self, mock_mcp_dependencies, sample_memories
+    ):
+        """Test a failed query maps to an empty list when others succeed."""
+        mock_memory, mock_agent, mock_settings = mock_mcp_dependencies
+        mock_memory.search_memories_batch = AsyncMock(
+            return_value=[sample_memories[:1], Exception("API timeout")]
+        )
+
+        result = await search_memories_batch(["CORS error", "Docker"], "test-user")
+
+        assert result == {"CORS error": sample_memories[:1], "Docker": []}
+
+    @pytest.mark.asyncio
+    async def test_search_memories_batch_all_failed(self, mock_mcp_dependencies):
+        """Test the call fails when every query's search failed."""
+        mock_memory, mock_agent, mock_settings = mock_mcp_dependencies
+        mock_memory.search_memories_batch = AsyncMock(
+            return_value=[Exception("API timeout"), Exception("API timeout")]
+        )
+
+        with pytest.raises(RuntimeError, match="Batch search failed: API timeout"):
+            await search_memories_batch(["CORS error", "Docker"], "test-user")
+
+    @pytest.mark.asyncio
+    async def test_search_memories_batch_rejects_too_many_queries(
+        self, mock_mcp_dependencies
+    ):
+        """Test batches over the query limit are rejected before searching."""
+        mock_memory, mock_agent, mock_settings = mock_mcp_dependencies
+        mock_memory.search_memories_batch = AsyncMock()
+
+        with pytest.raises(RuntimeError, match="At most 10 queries per batch"):
+            await search_memories_batch([f"query {i}" for i in range(11)])
+
+        mock_memory.search_memories_batch.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_list_memories_success(self, mock_mcp_dependencies, sample_memories):
         """Test successful memory listing."""
@@ -0,0 +1,257 @@
+"""
+Tests for the mitmproxy memory addon.
+
+Tests SSE parsing and the request/response hooks that capture Claude API
+conversations.
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytest.importorskip("mitmproxy")
+
+from mitmproxy import http  # noqa: E402
+from mitmproxy.test import tflow  # noqa: E402
+
+from memory_addon import MemoryAddon, parse_sse_response  # noqa: E402
+
+API_URL = "https://api.anthropic.com/v1/messages"
+
+
+def sse_stream(*events: tuple[str | None, dict], newline: bytes = b"\n") -> bytes:
+    """Build an SSE body from (event name, payload) pairs."""
+    lines = []
+    for name, payload in events:
+        if name is not None:
+            lines.append(f"event: {name}".encode())
+        lines.append(b"data: " + json.dumps(payload).encode())
+        lines.append(b"")
+    return newline.join(lines) + newline
+
+
+def text_events(text: str = "Hello world") -> list[tuple[str, dict]]:
+    """SSE events for a response with a single text block."""
+    return [
+        (
+            "message_start",
+            {
+                "type": "message_start",
+                "message": {"id": "msg_1", "model": "claude-sonnet-4", "usage": {}},
+            },
+        ),
+        (
+            "content_block_start",
+            {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""},
+            },
+        ),
+        (
+            "content_block_delta",
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": text[:5]},
+            },
+        ),
+        (
+            "content_block_delta",
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": text[5:]},
+            },
+        ),
+        ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+        ("message_stop", {"type": "message_stop"}),
+    ]
+
+
+def make_flow(request_body: dict, response_body: bytes = b"", streaming=True):
+    """Create an Anthropic API flow with the given request and response."""
+    request = http.Request.make(
+        "POST",
+        API_URL,
+        json.dumps(request_body),
+        {"content-type": "application/json"},
+    )
+    content_type = "text/event-stream" if streaming else "application/json"
+    response = http.Response.make(200, response_body, {"content-type": content_type})
+    return tflow.tflow(req=request, resp=response)
+
+
+class TestParseSseResponse:
+    """Test reconstruction of a Claude response from SSE events."""
+
+    def test_parses_text_stream(self):
+        """Test text deltas are joined into one text block."""
+        result = parse_sse_response(sse_stream(*text_events()))
+
+        assert result["id"] == "msg_1"
+        assert result["model"] == "claude-sonnet-4"
+        assert result["content"] == [{"type": "text", "text": "Hello world"}]
+
+    def test_skips_tool_use_blocks(self):
+        """Test tool_use blocks and their input deltas are not stored."""
+        events = text_events()
+        tool_events = [
+            (
+                "content_block_start",
+                {
+                    "type": "content_block_start",
+                    "index": 1,
+                    "content_block": {"type": "tool_use", "id": "tu_1", "input": {}},
+                },
+            ),
+            (
+                "content_block_delta",
+                {
+                    "type": "content_block_delta",
+                    "index": 1,
+                    "delta": {"type": "input_json_delta", "partial_json": '{"a": 1}'},
+                },
+            ),
+            ("content_block_stop", {"type": "content_block_stop", "index": 1}),
+        ]
+
+        result = parse_sse_response(sse_stream(*events[:-1], *tool_events, events[-1]))
+
+        assert result["content"] == [{"type": "text", "text": "Hello world"}]
+
+    def test_ignores_ping_events(self):
+        """Test ping events between blocks do not affect the result."""
+        events = text_events()
+        events.insert(3, ("ping", {"type": "ping"}))
+
+        result = parse_sse_response(sse_stream(*events))
+
+        assert result["content"] == [{"type": "text", "text": "Hello world"}]
+
+    def test_parses_crlf_stream(self):
+        """Test CRLF line endings parse the same as LF."""
+        result = parse_sse_response(sse_stream(*text_events(), newline=b"\r\n"))
+
+        assert result["content"] == [{"type": "text", "text": "Hello world"}]
+
+    def test_parses_stream_without_event_lines(self):
+        """Test data-only streams fall back to the payload's type field."""
+        events = [(None, payload) for _, payload in text_events()]
+
+        result = parse_sse_response(sse_stream(*events))
+
+        assert result["id"] == "msg_1"
+        assert result["content"] == [{"type": "text", "text": "Hello world"}]
+
+    def test_empty_content(self):
+        """Test empty content returns an empty dict."""
+        assert parse_sse_response(b"") == {}
+
+
+class TestMemoryAddonRequest:
+    """Test request hook bookkeeping."""
+
+    @pytest.mark.asyncio
+    async def test_stores_slim_request_metadata(self):
+        """Test only the fields response() needs are kept on the flow."""
+        user_msg = {"role": "user", "content": "Second question"}
+        flow = make_flow({
+            "model": "claude-sonnet-4",
+            "system": "x" * 1000,
+            "tools": [{"name": "Bash"}],
+            "messages": [
+                {"role": "user", "content": "First question"},
+                {"role": "assistant", "content": "First answer"},
+                user_msg,
+            ],
+        })
+
+        await MemoryAddon().request(flow)
+
+        assert flow.metadata["claude_request"] == {
+            "model": "claude-sonnet-4",
+            "last_user_message": user_msg,
+            "message_count": 3,
+        }
+
+    @pytest.mark.asyncio
+    async def test_skips_haiku_requests(self):
+        """Test background haiku requests are not tracked."""
+        flow = make_flow({
+            "model": "claude-3-5-haiku-20241022",
+            "messages": [{"role": "user", "content": "Summarize"}],
+        })
+
+        await MemoryAddon().request(flow)
+
+        assert "claude_request" not in flow.metadata
+
+    @pytest.mark.asyncio
+    async def test_null_model_is_tracked_as_unknown(self):
+        """Test a null model does not break request tracking."""
+        flow = make_flow({
+            "model": None,
+            "messages": [{"role": "user", "content": "Hi"}],
+        })
+
+        await MemoryAddon().request(flow)
+
+        assert flow.metadata["claude_request"]["model"] == "unknown"
+
+
+class TestMemoryAddonResponse:
+    """Test response hook storage."""
+
+    @pytest.mark.asyncio
+    async def test_stores_streamed_conversation_turn(self):
+        """Test a complete streamed response is stored with its user message."""
+        flow = make_flow(
+            {
+                "model": "claude-sonnet-4",
+                "messages": [{"role": "user", "content": "Say hello"}],
+            },
+            sse_stream(*text_events()),
+        )
+        addon = MemoryAddon()
+        await addon.request(flow)
+
+        with patch("memory_addon.memory_service") as mock_service:
+            mock_service.add_memory = AsyncMock(return_value={"id": "mem1"})
+            await addon.response(flow)
+
+        messages = mock_service.add_memory.call_args.kwargs["messages"]
+        assert messages == [
+            {"role": "user", "content": "Say hello"},
+            {"role": "assistant", "content": "Hello world"},
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"",
+            sse_stream(("ping", {"type": "ping"}), ("message_stop", {})),
+        ],
+    )
+    async def test_rejects_bodies_without_text_before_parsing(self, body):
+        """Test empty and text-less streams return without parsing."""
+        flow = make_flow(
+            {
+                "model": "claude-sonnet-4",
+                "messages": [{"role": "user", "content": "Hi"}],
+            },
+            body,
+        )
+        addon = MemoryAddon()
+        await addon.request(flow)
+
+        with (
+            patch("memory_addon.parse_sse_response") as mock_parse,
+            patch("memory_addon.memory_service") as mock_service,
+        ):
+            await addon.response(flow)
+
+        mock_parse.assert_not_called()
+        mock_service.add_memory.assert_not_called()
@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from mcp_mitm_mem0.config import Settings
+from mcp_mitm_mem0.config import Settings, settings
 from mcp_mitm_mem0.memory_service import MemoryService
 
 
@@ -92,6 +92,177 @@ class TestMemoryService:
             query="test query", user_id="test-user", limit=5
         )
 
+    @pytest.mark.asyncio
+    async def test_search_memories_batch_keeps_query_order(self, memory_service_mocked):
+        """Test batched searches return per-query results or the failure."""
+        error = Exception("API timeout")
+
+        async def search(query, user_id, limit):
+            if query == "broken":
+                raise error
+            return [{"id": query, "memory": query}]
+
+        with patch.object(
+            memory_service_mocked, "search_memories", AsyncMock(side_effect=search)
+        ) as mock_search:
+            results = await memory_service_mocked.search_memories_batch(
+                ["first", "broken", "second"], user_id="test-user", limit=3
+            )
+
+        assert results == [
+            [{"id": "first", "memory": "first"}],
+            error,
+            [{"id": "second", "memory": "second"}],
+        ]
+        mock_search.assert_any_call(query="first", user_id="test-user", limit=3)
+
+    @pytest.mark.asyncio
+    async def test_search_memories_batch_searches_repeated_queries_once(
+        self, memory_service_mocked
+    ):
+        """Test repeated queries in a batch share one search."""
+        with patch.object(
+            memory_service_mocked,
+            "search_memories",
+            AsyncMock(return_value=[{"id": "mem1"}]),
+        ) as mock_search:
+            results = await memory_service_mocked.search_memories_batch([
+                "cors",
+                "auth",
+                "cors",
+            ])
+
+        assert results == [[{"id": "mem1"}]] * 3
+        assert mock_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_memories_reuses_recent_results(self, memory_service_mocked):
+        """Test identical searches hit Mem0 once until a write clears the cache."""
+        client = memory_service_mocked.async_client
+        client.search = AsyncMock(return_value=[{"id": "mem1"}])
+        client.add = AsyncMock(return_value={"id": "mem2"})
+
+        with patch.object(settings, "search_cache_ttl", 60.0):
+            first = await memory_service_mocked.search_memories("query", "test-user")
+            second = await memory_service_mocked.search_memories("query", "test-user")
+            await memory_service_mocked.search_memories("query", "test-user", limit=5)
+
+            assert first == second == [{"id": "mem1"}]
+            assert client.search.call_count == 2
+
+            await memory_service_mocked.add_memory(
+                [{"role": "user", "content": "new"}], "test-user"
+            )
+            await memory_service_mocked.search_memories("query", "test-user")
+
+            assert client.search.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_search_cache_returns_copies(self, memory_service_mocked):
+        """Test mutating a returned result list does not change later hits."""
+        memory_service_mocked.async_client.search = AsyncMock(
+            return_value=[{"id": "mem1"}]
+        )
+
+        with patch.object(settings, "search_cache_ttl", 60.0):
+            first = await memory_service_mocked.search_memories("query", "test-user")
+            first.clear()
+            second = await memory_service_mocked.search_memories("query", "test-user")
+            second.append({"id": "extra"})
+            third = await memory_service_mocked.search_memories("query", "test-user")
+
+        assert third == [{"id": "mem1"}]
+        assert memory_service_mocked.async_client.search.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_search_cache_expires_after_ttl(self, memory_service_mocked):
+        """Test cached results are refetched once the TTL has passed."""
+        client = memory_service_mocked.async_client
+        client.search = AsyncMock(return_value=[{"id": "mem1"}])
+
+        with (
+            patch.object(settings, "search_cache_ttl", 60.0),
+            patch("mcp_mitm_mem0.memory_service.time.monotonic") as mock_clock,
+        ):
+            mock_clock.return_value = 1000.0
+            await memory_service_mocked.search_memories("query", "test-user")
+            mock_clock.return_value = 1059.0
+            await memory_service_mocked.search_memories("query", "test-user")
+            assert client.search.call_count == 1
+
+            mock_clock.return_value = 1061.0
+            await memory_service_mocked.search_memories("query", "test-user")
+            assert client.search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_cache_evicts_least_recently_used(self, memory_service_mocked):
+        """Test the cache drops the least recently used search when full."""
+        client = memory_service_mocked.async_client
+        client.search = AsyncMock(return_value=[])
+
+        with (
+            patch.object(settings, "search_cache_ttl", 60.0),
+            patch("mcp_mitm_mem0.memory_service.SEARCH_CACHE_SIZE", 2),
+        ):
+            for query in ("first", "second", "first", "third"):
+                await memory_service_mocked.search_memories(query, "test-user")
+            assert client.search.call_count == 3
+
+            # "second" was least recently used, so it was evicted
+            await memory_service_mocked.search_memories("first", "test-user")
+            assert client.search.call_count == 3
+            await memory_service_mocked.search_memories("second", "test-user")
+            assert client.search.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_search_cache_cleared_on_delete(self, memory_service_mocked):
+        """Test deleting a memory drops cached searches."""
+        client = memory_service_mocked.async_client
+        client.search = AsyncMock(return_value=[{"id": "mem1"}])
+        client.delete = AsyncMock(return_value={"message": "ok"})
+
+        with patch.object(settings, "search_cache_ttl", 60.0):
+            await memory_service_mocked.search_memories("query", "test-user")
+            await memory_service_mocked.delete_memory("mem1")
+            await memory_service_mocked.search_memories("query", "test-user")
+
+        assert client.search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_cache_disabled_with_zero_ttl(self, memory_service_mocked):
+        """Test a TTL of 0 sends every search to Mem0."""
+        client = memory_service_mocked.async_client
+        client.search = AsyncMock(return_value=[{"id": "mem1"}])
+
+        with patch.object(settings, "search_cache_ttl", 0):
+            await memory_service_mocked.search_memories("query", "test-user")
+            await memory_service_mocked.search_memories("query", "test-user")
+
+        assert client.search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_in_flight_during_write_is_not_cached(
+        self, memory_service_mocked
+    ):
+        """Test results fetched while a write completes are not cached."""
+        client = memory_service_mocked.async_client
+        client.delete = AsyncMock(return_value={"message": "ok"})
+
+        async def search_racing_delete(**kwargs):
+            await memory_service_mocked.delete_memory("mem1")
+            return [{"id": "mem1"}]
+
+        client.search = AsyncMock(side_effect=search_racing_delete)
+
+        with patch.object(settings, "search_cache_ttl", 60.0):
+            first = await memory_service_mocked.search_memories("query", "test-user")
+            client.search.side_effect = None
+            client.search.return_value = []
+            second = await memory_service_mocked.search_memories("query", "test-user")
+
+        assert first == [{"id": "mem1"}]
+        assert second == []
+
     @pytest.mark.asyncio
     async def test_get_all_memories_success(
         self, memory_service_mocked, sample_memories
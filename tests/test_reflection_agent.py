@@ -4,6 +4,7 @@ Comprehensive tests for ReflectionAgent.
 Tests pattern analysis, insight generation, and suggestion logic.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -48,6 +49,9 @@ class TestReflectionAgent:
         """Test analysis detecting coding-focused conversations."""
         with patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service:
             mock_service.get_all_memories = AsyncMock(return_value=sample_memories)
+            mock_service.search_memories_batch = AsyncMock(
+                side_effect=lambda queries, **kwargs: [[] for _ in queries]
+            )
             mock_service.add_memory = AsyncMock(return_value={"id": "reflection_mem"})
 
             result = await reflection_agent_mocked.analyze_recent_conversations(
@@ -232,6 +236,35 @@ class TestReflectionAgent:
 
             assert suggestions == []
 
+    @pytest.mark.asyncio
+    async def test_suggest_next_steps_cancels_search_when_analysis_fails(
+        self, reflection_agent_mocked
+    ):
+        """Test a failed analysis cancels the in-flight batch search."""
+        cancelled = asyncio.Event()
+
+        async def slow_search(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with (
+            patch.object(
+                reflection_agent_mocked,
+                "analyze_recent_conversations",
+                AsyncMock(side_effect=RuntimeError("analysis failed")),
+            ),
+            patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service,
+        ):
+            mock_service.search_memories_batch = slow_search
+
+            suggestions = await reflection_agent_mocked.suggest_next_steps("test_user")
+
+        assert suggestions == []
+        assert cancelled.is_set()
+
     @pytest.mark.asyncio
     async def test_analyze_recent_conversations_limits_results(
         self, reflection_agent_mocked
@@ -249,6 +282,9 @@ class TestReflectionAgent:
         with patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service:
             mock_service.get_all_memories = AsyncMock(return_value=many_memories)
             mock_service.add_memory = AsyncMock(return_value={"id": "reflection_mem"})
+            mock_service.search_memories_batch = AsyncMock(
+                side_effect=lambda queries, **kwargs: [[] for _ in queries]
+            )
 
             # Request only 10 recent memories
             result = await reflection_agent_mocked.analyze_recent_conversations(
@@ -270,6 +306,9 @@ class TestReflectionAgent:
 
         with patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service:
             mock_service.get_all_memories = AsyncMock(return_value=unsorted_memories)
+            mock_service.search_memories_batch = AsyncMock(
+                side_effect=lambda queries, **kwargs: [[] for _ in queries]
+            )
             mock_service.add_memory = AsyncMock(return_value={"id": "reflection_mem"})
 
             # Mock the _analyze_patterns to track what memories it receives
@@ -362,3 +401,189 @@ class TestReflectionAgent:
         # Should not crash with edge case content
         insights = await reflection_agent_mocked._analyze_patterns(edge_case_memories)
         assert isinstance(insights, list)
+
+    def test_extract_search_queries_detects_topic_classes(
+        self, reflection_agent_mocked
+    ):
+        """Test error, implementation and learning topics become queries."""
+        memories = [
+            {"memory": "Got an Error while trying to build the app"},
+            {"memory": "Can you explain this?"},
+        ]
+
+        queries = reflection_agent_mocked._extract_search_queries_from_memories(
+            memories
+        )
+
+        assert "errors debugging troubleshooting" in queries
+        assert "implementation development coding" in queries
+        assert "learning questions understanding" in queries
+
+    def test_identify_recurring_issues_counts_once_per_memory(
+        self, reflection_agent_mocked
+    ):
+        """Test recurring issues need matches in more than one memory."""
+        issue_memories = [
+            {"memory": "CORS error: blocked by Access-Control-Allow-Origin"},
+            {"memory": "Another cross-origin failure after npm install"},
+            {"memory": "Webpack build failed, webpack config is wrong"},
+        ]
+
+        issues = reflection_agent_mocked._identify_recurring_issues(issue_memories)
+
+        assert issues == ["CORS issues"]
+
+    def test_extract_topic_from_questions_prefers_earlier_topics(
+        self, reflection_agent_mocked
+    ):
+        """Test topic priority follows the topic table, not text order."""
+        questions = ["Why does my SQL query fail?", "How do I type this React hook?"]
+
+        topic = reflection_agent_mocked._extract_topic_from_questions(questions)
+
+        assert topic == "react"
+        assert (
+            reflection_agent_mocked._extract_topic_from_questions(["Hello?"])
+            == "general programming topics"
+        )
+
+    def test_deduplicate_memories_keeps_first_copy_and_idless(
+        self, reflection_agent_mocked
+    ):
+        """Test deduplication keeps order, first copies, and ID-less memories."""
+        first = {"id": "mem_1", "memory": "first"}
+        memories = [
+            first,
+            {"memory": "no id"},
+            {"id": "mem_2", "memory": "second"},
+            {"id": "mem_1", "memory": "duplicate"},
+            {"memory": "no id"},
+        ]
+
+        deduplicated = reflection_agent_mocked._deduplicate_memories(memories)
+
+        assert [m["memory"] for m in deduplicated] == [
+            "first",
+            "no id",
+            "second",
+            "no id",
+        ]
+        assert deduplicated[0] is first
+
+    @pytest.mark.asyncio
+    async def test_get_relevant_memories_uses_one_batched_search(
+        self, reflection_agent_mocked
+    ):
+        """Test relevant memories come from one batch, skipping failed queries."""
+        recent_memories = [
+            {"memory": "Fixing an error in the React component"},
+            {"memory": "How do I implement this?"},
+        ]
+
+        with patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service:
+            mock_service.search_memories_batch = AsyncMock(
+                return_value=[
+                    [{"id": "a"}],
+                    Exception("API timeout"),
+                    [{"id": "b"}, {"id": "c"}],
+                    [],
+                ]
+            )
+
+            memories = (
+                await reflection_agent_mocked._get_relevant_memories_for_analysis(
+                    "test_user", recent_memories, remaining_limit=2
+                )
+            )
+
+            mock_service.search_memories_batch.assert_called_once()
+            assert [m["id"] for m in memories] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_get_relevant_memories_falls_back_when_batch_fails(
+        self, reflection_agent_mocked
+    ):
+        """Test a failing batch search yields no extra memories."""
+        recent_memories = [{"memory": "Fixing an error in the React component"}]
+
+        with patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service:
+            mock_service.search_memories_batch = AsyncMock(
+                side_effect=Exception("Connection refused")
+            )
+
+            memories = (
+                await reflection_agent_mocked._get_relevant_memories_for_analysis(
+                    "test_user", recent_memories, remaining_limit=5
+                )
+            )
+
+            assert memories == []
+
+    def test_extract_search_queries_keeps_first_found_order(
+        self, reflection_agent_mocked
+    ):
+        """Test query order follows the memories, so the cap is deterministic."""
+        memories = [
+            {"memory": "Why is the python build failing with an error?"},
+            {"memory": "Docker setup"},
+        ]
+
+        queries = reflection_agent_mocked._extract_search_queries_from_memories(
+            memories
+        )
+
+        assert queries == [
+            "learning questions understanding",
+            "implementation development coding",
+            "errors debugging troubleshooting",
+            "python error",
+            "docker",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_suggest_next_steps_batches_issue_and_project_searches(
+        self, reflection_agent_mocked
+    ):
+        """Test issue and project memories come from one batched search."""
+        issue_memories = [
+            {"memory": "CORS error on the API"},
+            {"memory": "cross-origin request blocked again"},
+        ]
+
+        with (
+            patch.object(
+                reflection_agent_mocked, "analyze_recent_conversations"
+            ) as mock_analyze,
+            patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service,
+        ):
+            mock_analyze.return_value = {"insights": []}
+            mock_service.search_memories_batch = AsyncMock(
+                return_value=[issue_memories, []]
+            )
+
+            suggestions = await reflection_agent_mocked.suggest_next_steps("test_user")
+
+            mock_service.search_memories_batch.assert_called_once()
+            assert suggestions == [
+                "Document solution for recurring CORS issues - appears multiple times"
+            ]
+
+    @pytest.mark.asyncio
+    async def test_suggest_next_steps_returns_empty_when_search_fails(
+        self, reflection_agent_mocked
+    ):
+        """Test a failed issue or project search yields no suggestions."""
+        with (
+            patch.object(
+                reflection_agent_mocked, "analyze_recent_conversations"
+            ) as mock_analyze,
+            patch("mcp_mitm_mem0.reflection_agent.memory_service") as mock_service,
+        ):
+            mock_analyze.return_value = {"insights": []}
+            mock_service.search_memories_batch = AsyncMock(
+                return_value=[Exception("API timeout"), []]
+            )
+
+            suggestions = await reflection_agent_mocked.suggest_next_steps("test_user")
+
+            assert suggestions == []